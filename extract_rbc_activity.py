@@ -1,13 +1,19 @@
 
+import csv
 import os
 import re
 import sys
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import freeze_support
 from pathlib import Path
+from types import MappingProxyType
 from datetime import datetime
+from functools import lru_cache
 from configparser import ConfigParser
 
+import pymupdf
 import pdfplumber
-import pandas as pd
 
 # ====== CONFIG ======
 def load_config():
@@ -36,11 +42,12 @@ config = load_config()
 INPUT_DIR = config.get('paths', 'input_dir')
 OUTPUT_CSV = config.get('paths', 'output_csv')
 
-# Load action mappings
-ACTION_MAP = dict(config.items('actions'))
+# Load action mappings (read-only: the lookups derived from it below are
+# computed once and cached)
+ACTION_MAP = MappingProxyType(dict(config.items('actions')))
 
 # Load account mappings
-ACCOUNT_MAP = dict(config.items('accounts'))
+ACCOUNT_MAP = MappingProxyType(dict(config.items('accounts')))
 
 # Load transfer account settings
 REINVEST_TRANSFER_ACCOUNT = config.get('transfer_accounts', 'reinvest')
@@ -49,12 +56,86 @@ CASH_SUFFIX =  config.get('transfer_accounts', 'cash_suffix')
 
 
 RESP_GRANT = config.get('governement_grants', 'RESP')
+# Descriptions of government grant rows, which also get a RESP_GRANT income row
+GRANT_PREFIXES = ("Grant", "PGQC")
+
+# Output CSV columns, in order
+COLUMNS = [
+    "Date",
+    "Description",
+    "Action",
+    "Value",
+    "Price",
+    "Amount",
+    "Account",
+    "Trancfer Account",
+    "Units you own (post)",
+    "Total value ($)",
+    "Fund code",
+    "Fund name",
+]
+
+# One output row; fields are in the same order as COLUMNS
+Row = namedtuple(
+    "Row",
+    [
+        "date",
+        "description",
+        "action",
+        "value",
+        "price",
+        "amount",
+        "account",
+        "transfer_account",
+        "units_post",
+        "total_value",
+        "fund_code",
+        "fund_name",
+    ],
+)
 
 # Example combined date tokens in some PDFs: Jan102025, Jun302025
 DATE_TOKEN_RE = re.compile(r"^[A-Za-z]{3}\d{1,2}\d{4}$")
 NUM_RE = re.compile(r"^[\d,]+(\.\d+)?$")
-
-
+# Three-part dates: 'Dec 23 2024 ...'
+THREE_PART_DATE_RE = re.compile(
+    r"^(?P<month>[A-Za-z]{3})\s+(?P<day>\d{1,2})\s+(?P<year>\d{4})\s+\S"
+)
+# Activity section headers, looked for while outside a section
+SECTION_RE = re.compile(
+    r"(?P<mutual>Your investment activity with Royal Mutual Funds Inc\.)"
+    r"|(?P<savings>Your savings deposit activity)"
+)
+# Classifies a line inside a section in one match; dispatch on lastgroup.
+# Lines that match none of these are candidate activity rows.
+LINE_RE = re.compile(
+    # Page footer: 'Page 2 of 5'
+    r"(?P<footer>Page\s*\d+\s*of\s*\d+)"
+    # Fund header: 'RBC Select Balanced Portfolio - Sr. A (RBF460)'
+    r"|(?P<fund>(?P<fund_name>.+?)\s*\((?P<fund_code>RBF\d{3})\)(?:\s*\(continued\))?$)"
+    # RBC Savings Deposit fund header
+    r"|(?P<savings_fund>(?=.*Savings Deposit)(?=.*RBC))"
+    # Return of Capital unit price: '(0.0187000)'
+    r"|(?P<price>\((?P<unit_price>[\d,]+\.\d+)\)$)"
+)
+ACCOUNT_NUMBER_RE = re.compile(r"\b(\d{6,12})\b")
+# Plain numbers float() accepts as-is, without quotes or thousand separators
+FAST_FLOAT_RE = re.compile(r"^-?\d+(?:\.\d+)?$")
+
+
+def normalize_action(s: str) -> str:
+    return s.replace(" ", "").replace("-", "").lower()
+
+
+# ACTION_MAP is read-only after load, so precompute what the per-row
+# action checks need once.
+NORM_ACTION_MAP = tuple((normalize_action(k), v) for k, v in ACTION_MAP.items())
+# With no actions configured nothing may match, like any() over no keys;
+# an empty pattern would match every line
+ACTION_PREFILTER_RE = re.compile("|".join(re.escape(k) for k in ACTION_MAP) or r"(?!)")
+
+
+@lru_cache(maxsize=4096)
 def to_number(s: str):
     """
     Convert strings like:
@@ -69,6 +150,10 @@ def to_number(s: str):
     if not s:
         return ""
 
+    # Common case: nothing to clean up
+    if FAST_FLOAT_RE.match(s):
+        return float(s)
+
     # Strip surrounding quotes: "123.45" or '123.45'
     s = s.strip().strip('"').strip("'")
 
@@ -82,23 +167,12 @@ def to_number(s: str):
         return s
 
 
-def extract_date_and_rest(line):
-    tokens = line.split()
-    if tokens and DATE_TOKEN_RE.match(tokens[0]):
-        date_disp = format_date_token(tokens[0])
-        rest = " ".join(tokens[1:])  # everything after date token
-    else:
-        date_disp, rest = parse_line_with_three_part_date(line)
-    return date_disp, rest
-
-
-def format_date_token(tok: str) -> str:
+@lru_cache(maxsize=2048)
+def format_date_parts(month: str, day: str, year: str) -> str | None:
     """
-    Convert 'Jan102025' -> '2025-01-10'
+    Convert ('Jan', '10', '2025') -> '2025-01-10', or None if not a valid date.
+    Cached since the same dates repeat throughout a statement.
     """
-    month = tok[:3]
-    day = tok[3:-4]
-    year = tok[-4:]
     try:
         # Parse the date components and create a datetime object
         date_str = f"{month} {day} {year}"
@@ -106,77 +180,81 @@ def format_date_token(tok: str) -> str:
         # Format as ISO date
         return parsed_date.strftime("%Y-%m-%d")
     except ValueError:
-        return tok
+        return None
 
 
-def parse_line_with_three_part_date(line: str):
+@lru_cache(maxsize=2048)
+def format_date_token(tok: str) -> str:
     """
-    Parse date when the line starts like: 'Dec 23 2024 ...'
-    Returns (date_str, rest_of_line) or (None, None) if not matched.
+    Convert 'Jan102025' -> '2025-01-10'
     """
-    m = re.match(
-        r"^(?P<month>[A-Za-z]{3})\s+(?P<day>\d{1,2})\s+(?P<year>\d{4})\s+(?P<rest>.+)$",
-        line,
-    )
-    if not m:
-        return None, None
-
-    month = m.group("month")
-    day = m.group("day")
-    year = m.group("year")
-    rest = m.group("rest").strip()
-    
-    try:
-        # Parse the date and format as ISO date
-        date_str = f"{month} {day} {year}"
-        parsed_date = datetime.strptime(date_str, "%b %d %Y")
-        date_disp = parsed_date.strftime("%Y-%m-%d")
-        return date_disp, rest
-    except ValueError:
-        return None, None
+    return format_date_parts(tok[:3], tok[3:-4], tok[-4:]) or tok
 
 
-def split_description_and_numbers(s: str):
+def parse_row(line: str):
     """
-    Returns (description_string, list_of_numbers).
-    Description = everything before the first numeric token.
+    Split an activity line once into its date and the tokens after it.
+
+    The date is either a combined token ('Jan102025') or three parts
+    ('Dec 23 2024'). Returns (date_str, tokens, first_num_idx), where
+    tokens[:first_num_idx] is the description and tokens[first_num_idx:]
+    are the numbers (all tokens after the first number count as numbers).
+    Returns (None, [], 0) if the line doesn't start with a date.
     """
-    parts = s.split()
-    desc_tokens = []
-    num_tokens = []
-
-    found_number = False
-    for p in parts:
-        if not found_number and (
-            NUM_RE.match(p) or (p.startswith("-") and NUM_RE.match(p[1:]))
-        ):
-            found_number = True
-            num_tokens.append(p)
-        elif found_number:
-            # all tokens after first number are also numbers
-            num_tokens.append(p)
-        else:
-            desc_tokens.append(p)
-
-    description = " ".join(desc_tokens)
-    return description, num_tokens
+    tokens = line.split()
+    if tokens and DATE_TOKEN_RE.match(tokens[0]):
+        date_disp = format_date_token(tokens[0])
+        tokens = tokens[1:]
+    else:
+        m = THREE_PART_DATE_RE.match(line)
+        if not m:
+            return None, [], 0
+        date_disp = format_date_parts(m.group("month"), m.group("day"), m.group("year"))
+        if date_disp is None:
+            return None, [], 0
+        tokens = tokens[3:]
+
+    for i, p in enumerate(tokens):
+        if NUM_RE.match(p) or (p.startswith("-") and NUM_RE.match(p[1:])):
+            return date_disp, tokens, i
+    return date_disp, tokens, len(tokens)
 
 
+@lru_cache(maxsize=1024)
 def match_action(kind: str) -> str:
-    k_norm = kind.replace(" ", "").replace("-", "").lower()
-    for key, action in ACTION_MAP.items():
-        key_norm = key.replace(" ", "").replace("-", "").lower()
+    k_norm = normalize_action(kind)
+    for key_norm, action in NORM_ACTION_MAP:
         if key_norm in k_norm:
             return action
     return ""
 
 
+# Rows whose first token is exactly a configured action key (the usual
+# case, e.g. 'Contribution') resolve with one dict lookup
+ACTION_BY_TOKEN = MappingProxyType({k: match_action(k) for k in ACTION_MAP})
+
+
+def match_row_action(tokens: list[str]) -> str | None:
+    """
+    Return the action for a row's tokens (after the date), or None if the
+    row doesn't mention any configured action.
+    """
+    action = ACTION_BY_TOKEN.get(tokens[0])
+    if action is not None:
+        return action
+
+    if not ACTION_PREFILTER_RE.search(" ".join(tokens)):
+        return None
+    return match_action(tokens[0])
+
+
 def parse_activity_line(
     line: str,
     fund_code: str,
     fund_name: str,
-    source_file: str,
-    account_number: str | None,
+    src_suffix: str,
+    fund_account: str,
+    cash_account: str,
 ):
     """
     Parse a single activity line (Contribution / ClosingBalance / ReturnofCapital / IncomeReinvested).
@@ -184,12 +262,13 @@ def parse_activity_line(
     Returns:
       (record_or_None, pending_return_state)
     """
-    date_disp, rest = extract_date_and_rest(line)
+    date_disp, tokens, num_idx = parse_row(line)
+    action = match_row_action(tokens) if date_disp and tokens else None
 
-    if date_disp and rest and any(key in rest for key in ACTION_MAP.keys()):
+    if action is not None:
 
-        action = match_action(rest.split()[0])
-        description, nums = split_description_and_numbers(rest)
+        description = " ".join(tokens[:num_idx])
+        nums = tokens[num_idx:]
         if nums:
             # safe: take last 5 numeric values
             if len(nums) >= 5:
@@ -197,22 +276,22 @@ def parse_activity_line(
             else:
                 return None
 
-            transfer_account = REINVEST_TRANSFER_ACCOUNT if action == "Reinvest" else ACCOUNT_MAP[account_number] + ":" + CASH_SUFFIX
-
-            record = {
-                "Date": date_disp,
-                "Description": description + " src = " + source_file,
-                "Action": action,
-                "Value": to_number(amount),
-                "Price": to_number(unit_price),
-                "Amount": to_number(units_txn),
-                "Account": ACCOUNT_MAP[account_number] + ":" + fund_code,
-                "Trancfer Account": transfer_account,
-                "Units you own (post)": units_post,
-                "Total value ($)": total_val,
-                "Fund code": fund_code,
-                "Fund name": fund_name,
-            }
+            transfer_account = REINVEST_TRANSFER_ACCOUNT if action == "Reinvest" else cash_account
+
+            record = Row(
+                date=date_disp,
+                description=description + src_suffix,
+                action=action,
+                value=to_number(amount),
+                price=to_number(unit_price),
+                amount=to_number(units_txn),
+                account=fund_account,
+                transfer_account=transfer_account,
+                units_post=units_post,
+                total_value=total_val,
+                fund_code=fund_code,
+                fund_name=fund_name,
+            )
 
             return record
     return None
@@ -221,8 +300,9 @@ def parse_activity_line(
 def parse_savings_line(
     line: str,
     fund_name: str,
-    source_file: str,
-    account_number: str | None,
+    src_suffix: str,
+    savings_account: str,
+    cash_account: str,
 ):
     """
     Parse lines from the 'Your savings deposit activity' table.
@@ -236,11 +316,12 @@ def parse_savings_line(
     We only have: Date, Transaction, Amount, Total value.
     Unit price / units are left blank.
     """
-    date_disp, rest = extract_date_and_rest(line)
+    date_disp, tokens, num_idx = parse_row(line)
+    action = match_row_action(tokens) if date_disp and tokens else None
 
-    if date_disp and rest and any(key in rest for key in ACTION_MAP.keys()):
-        action = match_action(rest.split()[0])
-        description, nums = split_description_and_numbers(rest)
+    if action is not None:
+        description = " ".join(tokens[:num_idx])
+        nums = tokens[num_idx:]
 
         if nums:
             # safe: take last 5 numeric values
@@ -249,21 +330,21 @@ def parse_savings_line(
             else:
                 return None
 
-            transfer_account = REINVEST_TRANSFER_ACCOUNT if action == "Reinvest" else ACCOUNT_MAP[account_number] + ":" + CASH_SUFFIX
-            record = {
-                "Date": date_disp,
-                "Description": description + " src = " + source_file,
-                "Action": action,
-                "Value": to_number(amount),
-                "Price": "",
-                "Amount": "",
-                "Account": ACCOUNT_MAP[account_number] + ":SavingsDeposit",
-                "Trancfer Account": transfer_account,
-                "Units you own (post)": "",
-                "Total value ($)": to_number(total_val),
-                "Fund code": "",
-                "Fund name": fund_name,
-            }
+            transfer_account = REINVEST_TRANSFER_ACCOUNT if action == "Reinvest" else cash_account
+            record = Row(
+                date=date_disp,
+                description=description + src_suffix,
+                action=action,
+                value=to_number(amount),
+                price="",
+                amount="",
+                account=savings_account,
+                transfer_account=transfer_account,
+                units_post="",
+                total_value=to_number(total_val),
+                fund_code="",
+                fund_name=fund_name,
+            )
             return record
 
     return None
@@ -275,178 +356,265 @@ def extract_account_number(lines):
             if i + 1 < len(lines):
                 next_line = lines[i + 1]
                 # extract the first consecutive digits in the next line
-                m = re.search(r"\b(\d{6,12})\b", next_line)
+                m = ACCOUNT_NUMBER_RE.search(next_line)
                 if m:
                     return m.group(1)
     return None
 
 
-def extract_from_pdf_text(path: Path) -> list[dict]:
+def read_pdf_pages(path: Path) -> list[str]:
+    """
+    Return the raw text of every page in the PDF.
+
+    Uses PyMuPDF, which is much faster than pdfplumber since we only need
+    plain text. Falls back to pdfplumber if PyMuPDF fails on the file.
+    All pages are read in one pass so the document is closed before any
+    parsing starts.
+    """
+    try:
+        # Open by filename: MuPDF already reads the file on demand through
+        # fz_open_file, so memory-mapping it and passing stream= adds nothing.
+        doc = pymupdf.open(str(path))
+        try:
+            pages = []
+            for page in doc:
+                # sort=True rebuilds visual rows (one text run per table
+                # column) into single lines, like pdfplumber's extract_text()
+                text = page.get_text("text", sort=True)
+
+                # Scanned (image-only) pages carry little or no text layer and
+                # never contain activity rows; keep an empty slot so page
+                # positions stay intact.
+                if len(text) < 20 and page.get_images(full=False):
+                    text = ""
+                pages.append(text)
+            return pages
+        finally:
+            doc.close()
+    except Exception:
+        with pdfplumber.open(path) as pdf:
+            return [page.extract_text() or "" for page in pdf.pages]
+
+
+def extract_from_pdf_text(path: Path) -> list[Row]:
     """
     Parse the PDF by scanning raw text lines around:
       'Your investment activity with Royal Mutual Funds Inc.'
     and extracting activity lines per fund.
     """
-    records: list[dict] = []
-
-    with pdfplumber.open(path) as pdf:
-        account_number = None
-        for page in pdf.pages:
-            text = page.extract_text() or ""
-            lines = text.splitlines()
-
-            if page.page_number == 1:
-                account_number = extract_account_number(lines)
-
-            if account_number is None:
-                raise ValueError(f"Account number not found in PDF: {path.name}")
-
-            in_section = False
-            section_type = None  # 'mutual' or 'savings'
-            current_fund_code = ""
-            current_fund_name = ""
-            pending_return: dict | None = None
-
-            for raw in lines:
-                line = raw.strip()
-
-                # Enter section
-                if not in_section:
-                    # Mutual funds activity section
-                    if "Your investment activity with Royal Mutual Funds Inc." in line:
-                        in_section = True
-                        section_type = "mutual"
-                        continue
-
-                    # Savings deposit activity section
-                    if "Your savings deposit activity" in line:
-                        in_section = True
-                        section_type = "savings"
-                        # We know this whole table is for RBC Savings Deposit
-                        current_fund_name = "RBC Savings Deposit"
-                        current_fund_code = ""
-                        continue
+    records: list[Row] = []
 
-                    continue
+    pages = read_pdf_pages(path)
+    if not pages:
+        return records
 
-                # Heuristic: end section at page footer
-                if line.startswith("Page") and "of" in line:
-                    in_section = False
-                    current_fund_code = ""
-                    section_type = None
-                    current_fund_name = ""
-                    pending_return = None
-                    continue
+    # The account number is printed on the first page
+    account_number = extract_account_number(pages[0].splitlines())
+    if account_number is None:
+        raise ValueError(f"Account number not found in PDF: {path.name}")
+
+    if account_number not in ACCOUNT_MAP:
+        raise ValueError(f"Account number {account_number} not found in config: {path.name}")
+
+    # Ledger accounts are fixed per PDF; only the fund account changes, at
+    # fund headers
+    account_prefix = ACCOUNT_MAP[account_number]
+    cash_account = account_prefix + ":" + CASH_SUFFIX
+    savings_account = account_prefix + ":SavingsDeposit"
+    no_fund_account = account_prefix + ":"
+
+    # Appended to every row's description to record which PDF it came from
+    src_suffix = " src = " + path.name
+
+    # Bound once; called for every row in the loop below
+    append_record = records.append
+
+    for text in pages:
+        # Sections start fresh on every page, so a page without a section
+        # header (cover pages, disclaimers, ...) can't produce any rows
+        if not SECTION_RE.search(text):
+            continue
+
+        lines = text.splitlines()
 
-                # Detect fund header lines, e.g.:
-                # 'RBC Select Balanced Portfolio - Sr. A (RBF460)'
-                m_fund = re.match(r"(.+?)\s*\((RBF\d{3})\)(?:\s*\(continued\))?$", line)
-                if m_fund:
-                    current_fund_name = m_fund.group(1).strip()
-                    current_fund_code = m_fund.group(2).strip()
+        in_section = False
+        section_type = None  # 'mutual' or 'savings'
+        current_fund_code = ""
+        current_fund_name = ""
+        fund_account = no_fund_account
+        pending_return: Row | None = None
+
+        for raw in lines:
+            line = raw.strip()
+
+            # Enter section
+            if not in_section:
+                m_section = SECTION_RE.search(line)
+                if m_section is None:
                     continue
 
-                # Detect RBC Savings Deposit fund header
-                if "Savings Deposit" in line and "RBC" in line:
+                in_section = True
+                # Mutual funds activity section
+                if m_section.lastgroup == "mutual":
+                    section_type = "mutual"
+                # Savings deposit activity section
+                else:
+                    section_type = "savings"
+                    # We know this whole table is for RBC Savings Deposit
                     current_fund_name = "RBC Savings Deposit"
                     current_fund_code = ""
-                    continue
+                    fund_account = no_fund_account
+                continue
+
+            # Most lines are activity rows. Only run LINE_RE when the line has
+            # the fixed text one of its alternatives needs; these substring
+            # checks are far cheaper than the regex failing on a row.
+            if (
+                "(RBF" in line
+                or "Savings Deposit" in line
+                or line.startswith(("Page", "("))
+            ):
+                m_line = LINE_RE.match(line)
+                kind = m_line.lastgroup if m_line else None
+            else:
+                kind = None
+
+            # Heuristic: end section at page footer
+            if kind == "footer":
+                in_section = False
+                current_fund_code = ""
+                fund_account = no_fund_account
+                section_type = None
+                current_fund_name = ""
+                pending_return = None
+                continue
+
+            # Detect fund header lines, e.g.:
+            # 'RBC Select Balanced Portfolio - Sr. A (RBF460)'
+            if kind == "fund":
+                current_fund_name = m_line.group("fund_name").strip()
+                current_fund_code = m_line.group("fund_code")
+                fund_account = account_prefix + ":" + current_fund_code
+                continue
+
+            # Detect RBC Savings Deposit fund header
+            if kind == "savings_fund":
+                current_fund_name = "RBC Savings Deposit"
+                current_fund_code = ""
+                fund_account = no_fund_account
+                continue
+
+            # If we have a pending Return of Capital, next line might be '(0.0187000)' etc.
+            if kind == "price" and pending_return is not None:
+                append_record(pending_return._replace(price=m_line.group("unit_price")))
+                pending_return = None
+                continue
+
+            # Parse activity rows
+            if section_type == "mutual":
+                rec= parse_activity_line(
+                    line=line,
+                    fund_code=current_fund_code,
+                    fund_name=current_fund_name,
+                    src_suffix=src_suffix,
+                    fund_account=fund_account,
+                    cash_account=cash_account,
+                )
+                if rec is not None:
+                    append_record(rec)
+                    if rec.description.startswith(GRANT_PREFIXES):
+                        rec_income = Row(
+                            date=rec.date,
+                            description=rec.description,
+                            action=rec.action,
+                            value=rec.value,
+                            price="",
+                            amount="",
+                            account=rec.account.replace(rec.fund_code, CASH_SUFFIX),
+                            transfer_account=RESP_GRANT,
+                            units_post="",
+                            total_value="",
+                            fund_code="",
+                            fund_name="",
+                        )
+                        append_record(rec_income)
+
+            elif section_type == "savings":
+                rec = parse_savings_line(
+                    line=line,
+                    fund_name=current_fund_name or "RBC Savings Deposit",
+                    src_suffix=src_suffix,
+                    savings_account=savings_account,
+                    cash_account=cash_account,
+                )
+                if rec is not None:
+                    append_record(rec)
 
-                # If we have a pending Return of Capital, next line might be '(0.0187000)' etc.
-                m_price = re.match(r"^\(([\d,]+\.\d+)\)$", line)
-                if m_price and pending_return is not None:
-                    pending_return["Unit price ($)"] = m_price.group(1)
-                    records.append(pending_return)
-                    pending_return = None
-                    continue
+    return records
 
-                # Parse activity rows
-                if section_type == "mutual":
-                    rec= parse_activity_line(
-                        line=line,
-                        fund_code=current_fund_code,
-                        fund_name=current_fund_name,
-                        source_file=path.name,
-                        account_number=account_number,
-                    )
-                    if rec is not None:
-                        records.append(rec)
-                        if rec["Description"].startswith(("Grant", "PGQC")) :
-                            rec_income = {
-                                "Date": rec["Date"],
-                                "Description": rec["Description"],
-                                "Action": rec["Action"],
-                                "Value": rec["Value"],
-                                "Price": "",
-                                "Amount": "",
-                                "Account": rec["Account"].replace(rec["Fund code"], CASH_SUFFIX),
-                                "Trancfer Account": RESP_GRANT,
-                                "Units you own (post)":"",
-                                "Total value ($)": "",
-                                "Fund code": "",
-                                "Fund name": "",
-                                }
-                            records.append(rec_income)
-
-                elif section_type == "savings":
-                    rec = parse_savings_line(
-                        line=line,
-                        fund_name=current_fund_name or "RBC Savings Deposit",
-                        source_file=path.name,
-                        account_number=account_number,
-                    )
-                    if rec is not None:
-                        records.append(rec)
 
-    return records
+def process_pdf(pdf_path: Path) -> list[Row]:
+    """
+    Worker entry point: extract records from one PDF, reporting errors
+    instead of raising so one bad file doesn't abort the whole run.
+    """
+    print(f"Processing: {pdf_path}")
+    try:
+        return extract_from_pdf_text(pdf_path)
+    except Exception as e:
+        print(f"Error processing {pdf_path}: {e}")
+        return []
 
 
 def main():
-    all_records: list[dict] = []
-
     input_dir = Path(INPUT_DIR)
     if not input_dir.exists():
         print(f"Input folder not found: {input_dir.resolve()}")
         return
 
-    for fname in os.listdir(input_dir):
-        if not fname.lower().endswith(".pdf"):
-            continue
+    pdf_paths = [p for p in input_dir.iterdir() if p.suffix.lower() == ".pdf"]
 
-        pdf_path = input_dir / fname
-        print(f"Processing: {pdf_path}")
-        try:
-            recs = extract_from_pdf_text(pdf_path)
-            all_records.extend(recs)
-        except Exception as e:
-            print(f"Error processing {pdf_path}: {e}")
+    # Rows are streamed to a temporary file next to the output, which only
+    # replaces OUTPUT_CSV once every PDF has been processed. A run that dies
+    # midway (crashed worker, Ctrl-C) leaves the previous output untouched.
+    tmp_csv = OUTPUT_CSV + ".tmp"
+    row_count = 0
+    out = None
+    try:
+        # Each PDF is independent, so parse them in parallel worker processes.
+        # map() keeps results in input order; rows are written as each PDF
+        # finishes instead of being buffered for the whole run.
+        with ProcessPoolExecutor() as executor:
+            for recs in executor.map(process_pdf, pdf_paths, chunksize=1):
+                if not recs:
+                    continue
 
-    if not all_records:
+                if out is None:
+                    # Only create the CSV once there is something to write
+                    out = open(tmp_csv, "w", newline="", encoding="utf-8")
+                    writer = csv.writer(out, lineterminator=os.linesep)
+                    writer.writerow(COLUMNS)
+
+                writer.writerows(recs)
+                row_count += len(recs)
+    except BaseException:
+        if out is not None:
+            out.close()
+            os.remove(tmp_csv)
+        raise
+
+    if out is not None:
+        out.close()
+        os.replace(tmp_csv, OUTPUT_CSV)
+
+    if not row_count:
         print("No records found. Check folder path or PDF layout.")
         return
 
-    df = pd.DataFrame(all_records)
-
-    # Ensure column order is exactly as requested
-    columns = [
-        "Date",
-        "Description",
-        "Action",
-        "Value",
-        "Price",
-        "Amount",
-        "Account",
-        "Trancfer Account",
-        "Units you own (post)",
-        "Total value ($)",
-        "Fund code",
-        "Fund name",
-    ]
-    df = df[columns]
-
-    df.to_csv(OUTPUT_CSV, index=False)
-    print(f"Done. Saved {len(df)} rows to {OUTPUT_CSV}")
+    print(f"Done. Saved {row_count} rows to {OUTPUT_CSV}")
 
 
 if __name__ == "__main__":
+    # Needed for worker processes in the PyInstaller onefile binary
+    freeze_support()
     main()